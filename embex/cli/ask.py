@@ -12,13 +12,10 @@ Usage:
 from typing import Optional
 import typer
 
-from embex.config import find_project_root, load_config, chroma_path
-from embex.core.embedder import Embedder
-from embex.core.vector_store import VectorStore
-from embex.core.rag import ask as rag_ask
+from embex.config import find_project_root, load_config, chroma_path, cache_db_path
+from embex.core.cache import ResponseCache
 from embex.utils.display import console, error, info
 
-from rich.markdown import Markdown
 from rich.rule import Rule
 
 
@@ -26,10 +23,20 @@ def ask_command(
     question: str = typer.Argument(..., help="Your question about the codebase."),
     top_k: int = typer.Option(8, "--top-k", "-k", help="Number of chunks to retrieve."),
     folder: Optional[str] = typer.Option(None, "--folder", "-f", help="Limit search to a folder."),
-    threshold: float = typer.Option(0.30, "--threshold", "-t", help="Minimum similarity score (0-1)."),
+    threshold: float = typer.Option(0.25, "--threshold", "-t", help="Minimum similarity score (0-1)."),
     show_sources: bool = typer.Option(True, "--sources/--no-sources", help="Show source chunks."),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse cached answers for repeated questions."),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Render the answer as it is generated."),
 ):
     """Ask a question about your codebase — get an AI answer with citations."""
+    # Heavy imports (chromadb, sentence-transformers, openai) are deferred so
+    # that `embex --help` and other commands don't pay for them.
+    from embex.core.embedder import Embedder
+    from embex.core.vector_store import VectorStore
+    from embex.core.rag import ask as rag_ask
+    from rich.live import Live
+    from rich.markdown import Markdown
+
     try:
         project_root = find_project_root()
     except FileNotFoundError:
@@ -37,17 +44,13 @@ def ask_command(
         raise typer.Exit(1)
 
     config = load_config(project_root)
+    cache = ResponseCache(cache_db_path(project_root)) if use_cache else None
 
     try:
-        embedder = Embedder(config)
-    except EnvironmentError as exc:
-        error(str(exc))
-        raise typer.Exit(1)
+        embedder = Embedder(config, cache=cache)
+        vector_store = VectorStore(chroma_path(project_root), config.index)
+        info(f"Searching codebase for: [bold]{question}[/bold]")
 
-    vector_store = VectorStore(chroma_path(project_root))
-    info(f"Searching codebase for: [bold]{question}[/bold]")
-
-    try:
         result = rag_ask(
             question,
             config=config,
@@ -56,15 +59,29 @@ def ask_command(
             top_k=top_k,
             folder=folder,
             relevance_threshold=threshold,
+            cache=cache,
+            stream=stream,
         )
+
+        # Show the answer
+        console.print()
+        console.print(Rule("[bold green]Answer[/bold green]", style="green"))
+        if stream:
+            # Render fragments live as they arrive, then print the final text once
+            answer = ""
+            with Live(Markdown(""), console=console, refresh_per_second=12, transient=True) as live:
+                for fragment in result["answer"]:
+                    answer += fragment
+                    live.update(Markdown(answer))
+            console.print(Markdown(answer))
+        else:
+            console.print(Markdown(result["answer"]))
     except (EnvironmentError, RuntimeError) as exc:
         error(str(exc))
         raise typer.Exit(1)
-
-    # Show the answer
-    console.print()
-    console.print(Rule("[bold green]Answer[/bold green]", style="green"))
-    console.print(Markdown(result["answer"]))
+    finally:
+        if cache is not None:
+            cache.close()
 
     # Show the sources
     if show_sources and result["sources"]:
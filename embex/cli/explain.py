@@ -6,13 +6,15 @@ Two modes:
   - LLM-powered (--llm flag) — sends code to z.ai for a natural language summary
 """
 
+import ast
+import re
 import typer
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from embex.config import find_project_root, load_config, chroma_path
-from embex.core.vector_store import VectorStore
-from embex.core.embedder import Embedder
+from embex.config import find_project_root, load_config, chroma_path, cache_db_path
+from embex.core.cache import ResponseCache, cache_key
 from embex.utils.display import console, error, info
+from embex.utils.ignore import get_folder
 
 from rich.panel import Panel
 from rich import box
@@ -23,9 +25,12 @@ def _static_analysis(content, norm_path):
     lines = content.split("\n")
     total_lines = len(lines)
 
-    imports = [l.strip() for l in lines if l.strip().startswith(("import ", "from "))]
-    functions = [l.strip() for l in lines if l.strip().startswith("def ")]
-    classes = [l.strip() for l in lines if l.strip().startswith("class ")]
+    outline = None
+    if norm_path.endswith(".py"):
+        outline = _python_outline(content, lines)
+    if outline is None:
+        outline = _line_outline(content, lines)
+    imports, functions, classes, docstrings = outline
 
     parts = []
     parts.append(f"[bold cyan]File:[/bold cyan] {norm_path}")
@@ -48,8 +53,6 @@ def _static_analysis(content, norm_path):
         for fn in functions:
             parts.append(f"  [dim]•[/dim] {fn}")
 
-    # Extract and show docstrings
-    docstrings = _extract_docstrings(lines)
     if docstrings:
         parts.append(f"\n[bold blue]Purpose:[/bold blue]")
         for doc in docstrings[:3]:
@@ -59,6 +62,51 @@ def _static_analysis(content, norm_path):
     return parts
 
 
+def _python_outline(content, lines):
+    """Collect imports, functions, classes and docstrings in one AST pass.
+
+    Returns None if the source doesn't parse, so the caller can fall back
+    to the line scanner.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    imports, functions, classes = [], [], []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node)
+
+    def source_lines(nodes):
+        return [lines[n.lineno - 1].strip() for n in sorted(nodes, key=lambda n: n.lineno)]
+
+    docstrings = []
+    for node in [tree] + sorted(classes + functions, key=lambda n: n.lineno):
+        doc = ast.get_docstring(node)
+        if doc:
+            docstrings.append(" ".join(doc.split()))
+
+    return source_lines(imports), source_lines(functions), source_lines(classes), docstrings
+
+
+# Lines starting (after indentation) with import/from/def/class
+_OUTLINE_RE = re.compile(r"^[^\S\n]*((import|from|def|class) [^\n]*)", re.MULTILINE)
+
+
+def _line_outline(content, lines):
+    """Fallback for non-Python or unparsable files: one regex sweep over the source."""
+    imports, functions, classes = [], [], []
+    buckets = {"import": imports, "from": imports, "def": functions, "class": classes}
+    for match in _OUTLINE_RE.finditer(content):
+        buckets[match.group(2)].append(match.group(1).strip())
+    return imports, functions, classes, _extract_docstrings(lines)
+
+
 def _extract_docstrings(lines):
     """Pull out module/class/function docstrings from the source."""
     docstrings = []
@@ -86,13 +134,21 @@ def _extract_docstrings(lines):
     return docstrings
 
 
-def _llm_explain(content, norm_path, config=None, model=None):
+# System prompt for the LLM explanation
+EXPLAIN_PROMPT = (
+    "You are a senior software engineer. Explain what the given code file does "
+    "in clear, concise language. Cover: purpose, key functions/classes, "
+    "dependencies, and how it fits into a larger project. "
+    "Keep your response under 300 words. Use bullet points."
+)
+
+
+def _llm_explain(content, norm_path, config=None, model=None, cache=None):
     """Use the z.ai LLM to generate a natural language explanation."""
     import os
-    from dotenv import load_dotenv
+    from embex.core.rag import complete, load_env
 
-    load_dotenv()
-    load_dotenv(dotenv_path=Path.home() / ".embex" / ".env", override=False)
+    load_env()
 
     cfg_model = config.llm.model if config else "glm-4.7-flash"
     cfg_api_key_env = config.llm.api_key_env if config else "ZAI_API_KEY"
@@ -103,53 +159,46 @@ def _llm_explain(content, norm_path, config=None, model=None):
     if not api_key:
         return f"[red]Error:[/red] {cfg_api_key_env} not found. Set it in your .env file."
 
-    try:
-        from openai import OpenAI
+    # Limit code length to avoid token limits
+    max_chars = 12_000
+    truncated = content[:max_chars]
+    if len(content) > max_chars:
+        truncated += f"\n\n... (truncated, {len(content)} total chars)"
+    user_prompt = f"Explain this file ({norm_path}):\n\n```\n{truncated}\n```"
 
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.z.ai/api/paas/v4/",
-        )
-
-        # Limit code length to avoid token limits
-        max_chars = 12_000
-        truncated = content[:max_chars]
-        if len(content) > max_chars:
-            truncated += f"\n\n... (truncated, {len(content)} total chars)"
-
-        response = client.chat.completions.create(
-            model=final_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a senior software engineer. Explain what the given code file does "
-                        "in clear, concise language. Cover: purpose, key functions/classes, "
-                        "dependencies, and how it fits into a larger project. "
-                        "Keep your response under 300 words. Use bullet points."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": f"Explain this file ({norm_path}):\n\n```\n{truncated}\n```",
-                },
-            ],
-            extra_body={"thinking": {"type": "disabled"}},
-            max_tokens=500,
-            temperature=0.7,
-        )
+    key = cache_key("llm", final_model, EXPLAIN_PROMPT, user_prompt)
+    if cache is not None:
+        cached = cache.get_text(key)
+        if cached is not None:
+            return cached
 
-        msg = response.choices[0].message
-        return msg.content or getattr(msg, "reasoning_content", None) or "No response generated."
+    try:
+        answer = complete(EXPLAIN_PROMPT, user_prompt, final_model, api_key, max_tokens=500)
+        if not answer:
+            return "No response generated."
+        if cache is not None:
+            cache.set_text(key, answer)
+        return answer
 
     except Exception as e:
         return f"[red]LLM Error:[/red] {e}"
 
 
+def _llm_explain_task(content, norm_path, config, model, cache_path):
+    """Run _llm_explain on a worker thread with its own cache connection."""
+    cache = ResponseCache(cache_path) if cache_path is not None else None
+    try:
+        return _llm_explain(content, norm_path, config, model, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
 def explain_command(
     file_path: str = typer.Argument(..., help="Path to the file to explain."),
     llm: bool = typer.Option(False, "--llm", "-l", help="Use LLM for a richer explanation."),
     model: str = typer.Option(None, "--model", "-m", help="Override LLM model name."),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse cached LLM answers and embeddings."),
 ):
     """Summarize what a file does — static analysis or LLM-powered."""
     try:
@@ -172,36 +221,69 @@ def explain_command(
         info(f"File '{norm_path}' is empty.")
         raise typer.Exit(0)
 
+    # Start the LLM request first so the HTTP round trip overlaps with the
+    # local analysis below (SQLite connections can't cross threads, so the
+    # worker opens its own cache)
+    executor = llm_future = None
+    if llm:
+        executor = ThreadPoolExecutor(max_workers=1)
+        llm_future = executor.submit(
+            _llm_explain_task, content, norm_path, config, model,
+            cache_db_path(project_root) if use_cache else None,
+        )
+
+    cache = ResponseCache(cache_db_path(project_root)) if use_cache else None
+
     # Run static analysis
     summary_parts = _static_analysis(content, norm_path)
 
     # Find related files using embeddings
     try:
-        embedder = Embedder(config)
-        vector_store = VectorStore(chroma_path(project_root))
-        query_embedding = embedder.embed_query(content[:500])
-        related = vector_store.query(query_embedding=query_embedding, top_k=3)
+        from embex.core.vector_store import VectorStore
+
+        vector_store = VectorStore(chroma_path(project_root), config.index)
+
+        # Reuse the file's stored embedding if it's indexed; only embed the
+        # content (loading the model) when it isn't
+        folder = get_folder(full_path, project_root)
+        query_embedding = vector_store.get_file_embedding(norm_path, folder)
+        if query_embedding is None:
+            from embex.core.embedder import Embedder
+
+            embedder = Embedder(config, cache=cache)
+            query_embedding = embedder.embed_query(content[:500])
+
+        related = vector_store.query(query_embedding=query_embedding, top_k=3, exclude_file=norm_path)
 
         if related:
             summary_parts.append(f"\n[bold white]Related files:[/bold white]")
             seen = set()
             for r in related:
                 rp = r["file_path"]
-                if rp != norm_path and rp not in seen:
+                if rp not in seen:
                     seen.add(rp)
                     summary_parts.append(f"  [dim]•[/dim] {rp} (similarity: {r['score']:.3f})")
     except Exception:
         pass  # not critical if embeddings fail
 
-    # LLM explanation (optional)
-    if llm:
-        final_model = model or config.llm.model
-        summary_parts.append(f"\n[bold cyan]═══ LLM Analysis (z.ai:{final_model}) ═══[/bold cyan]")
-        llm_result = _llm_explain(content, norm_path, config, model)
-        summary_parts.append(llm_result)
+    if cache is not None:
+        cache.close()
 
+    # Show the static results right away; the LLM answer follows in its own panel
     console.print(Panel(
         "\n".join(summary_parts),
         title=f"[bold]Explanation: {norm_path}[/bold]",
         box=box.ROUNDED,
     ))
+
+    # LLM explanation (optional)
+    if llm_future is not None:
+        final_model = model or config.llm.model
+        with console.status("[cyan]Thinking...[/cyan]"):
+            llm_result = llm_future.result()
+        executor.shutdown()
+        console.print(Panel(
+            llm_result,
+            title=f"[bold cyan]LLM Analysis (z.ai:{final_model})[/bold cyan]",
+            box=box.ROUNDED,
+        ))
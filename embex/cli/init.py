@@ -10,10 +10,7 @@ from embex.config import (
     EmbexConfig, create_default_config, write_config,
     embex_dir, chroma_path, history_db_path, config_path,
 )
-from embex.core.embedder import Embedder
-from embex.core.vector_store import VectorStore
 from embex.core.history_store import HistoryStore
-from embex.core.scanner import scan_project
 from embex.utils.display import success, error, info
 
 
@@ -21,6 +18,12 @@ def init_command(
     path: str = typer.Argument(".", help="Path to the project root."),
 ):
     """Initialize Embex in a project directory."""
+    # Heavy imports (chromadb, sentence-transformers) are deferred so that
+    # `embex --help` and other commands don't pay for them.
+    from embex.core.embedder import Embedder
+    from embex.core.vector_store import VectorStore
+    from embex.core.scanner import scan_project
+
     project_root = Path(path).resolve()
 
     if not project_root.is_dir():
@@ -48,7 +51,7 @@ def init_command(
         # Create .gitignore inside .embex/
         gitignore_path = dot_embex / ".gitignore"
         gitignore_path.write_text(
-            "# Auto-generated by Embex\nchroma/\nhistory.db\n",
+            "# Auto-generated by Embex\nchroma/\nhistory.db\ncache.db\n",
             encoding="utf-8",
         )
         success("Created .embex/.gitignore")
@@ -64,21 +67,19 @@ def init_command(
         error(str(exc))
         raise typer.Exit(1)
 
-    vector_store = VectorStore(chroma_path(project_root))
-    history_store = HistoryStore(history_db_path(project_root))
-    success("Initialized ChromaDB and SQLite stores")
-
-    # Scan the project
-    info("Scanning project files...")
-    result = scan_project(
-        project_root=project_root,
-        config=config,
-        embedder=embedder,
-        vector_store=vector_store,
-        history_store=history_store,
-    )
+    vector_store = VectorStore(chroma_path(project_root), config.index)
+    with HistoryStore(history_db_path(project_root)) as history_store:
+        success("Initialized ChromaDB and SQLite stores")
 
-    history_store.close()
+        # Scan the project
+        info("Scanning project files...")
+        result = scan_project(
+            project_root=project_root,
+            config=config,
+            embedder=embedder,
+            vector_store=vector_store,
+            history_store=history_store,
+        )
 
     # Print summary
     skipped = result.get("files_skipped", 0)
@@ -8,40 +8,58 @@ Usage examples:
     embex restore . --all
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 import typer
 
 from embex.config import find_project_root, history_db_path
-from embex.core.history_store import HistoryStore
+from embex.core.history_store import SQL_BATCH, HistoryStore
 from embex.utils.display import success, error, info, warning
 
 
-def _restore_single(history_store, project_root, norm_path, version, confirm_overwrite=True):
-    """Restore one file. Returns True on success, False on skip."""
+# Parallel file writes during a folder restore
+RESTORE_WORKERS = 8
+
+
+def _resolve_snapshot(history_store, norm_path, version):
+    """Look up the snapshot to restore. Returns (version, content), or None on skip."""
     if version is None:
         ver = history_store.get_latest_version(norm_path)
         if ver == 0:
             warning(f"  No history found for '{norm_path}' — skipped.")
-            return False
+            return None
     else:
         ver = version
 
     content = history_store.get_snapshot(norm_path, ver)
     if content is None:
         warning(f"  Version {ver} not found for '{norm_path}' — skipped.")
-        return False
+        return None
+    return ver, content
 
-    target = project_root / Path(norm_path)
+
+def _write_file(target, content):
+    """Write restored content to disk, creating parent folders as needed."""
     target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content, encoding="utf-8")
+
+
+def _restore_single(history_store, project_root, norm_path, version, confirm_overwrite=True):
+    """Restore one file. Returns True on success, False on skip."""
+    snap = _resolve_snapshot(history_store, norm_path, version)
+    if snap is None:
+        return False
+    ver, content = snap
 
+    target = project_root / Path(norm_path)
     if confirm_overwrite and target.exists():
         confirm = typer.confirm(f"Overwrite '{norm_path}' with version {ver}?", default=True)
         if not confirm:
             info(f"  Skipped '{norm_path}'.")
             return False
 
-    target.write_text(content, encoding="utf-8")
+    _write_file(target, content)
     history_store.restore_to_version(norm_path, ver)
     return True
 
@@ -67,69 +85,89 @@ def restore_command(
         error("No Embex project found. Run 'embex init' first.")
         raise typer.Exit(1)
 
-    history_store = HistoryStore(history_db_path(project_root))
-    norm_path = path.replace("\\", "/").rstrip("/")
-
-    # Figure out if this is a folder restore or single file restore
-    is_folder = all_files or path.endswith("/") or path == "."
-
-    if not is_folder:
-        latest = history_store.get_latest_version(norm_path)
-        if latest == 0:
-            # No exact match — try as folder prefix
-            candidates = history_store.list_files_in_folder(norm_path)
-            if candidates:
-                is_folder = True
+    with HistoryStore(history_db_path(project_root)) as history_store:
+        norm_path = path.replace("\\", "/").rstrip("/")
+
+        # Figure out if this is a folder restore or single file restore
+        is_folder = all_files or path.endswith("/") or path == "."
+
+        if not is_folder:
+            latest = history_store.get_latest_version(norm_path)
+            if latest == 0:
+                # No exact match — try as folder prefix
+                candidates = history_store.list_files_in_folder(norm_path)
+                if candidates:
+                    is_folder = True
+                else:
+                    error(f"No history found for '{norm_path}'.")
+                    raise typer.Exit(1)
+
+        # Folder restore
+        if is_folder:
+            if all_files or norm_path == ".":
+                files = history_store.list_all_files()
+                scope_label = "all tracked files"
             else:
-                history_store.close()
-                error(f"No history found for '{norm_path}'.")
+                files = history_store.list_files_in_folder(norm_path)
+                scope_label = f"'{norm_path}/' ({len(files)} file(s))"
+
+            if not files:
+                error("No tracked files found matching that path.")
                 raise typer.Exit(1)
 
-    # Folder restore
-    if is_folder:
-        if all_files or norm_path == ".":
-            files = history_store.list_all_files()
-            scope_label = "all tracked files"
+            ver_label = f"version {version}" if version is not None else "latest version"
+            info(f"Restoring {scope_label} to {ver_label}.")
+
+            if not yes:
+                confirm = typer.confirm(
+                    f"This will recreate {len(files)} file(s). Continue?", default=True,
+                )
+                if not confirm:
+                    info("Restore cancelled.")
+                    raise typer.Exit(0)
+
+            # Snapshots are read here on the one SQLite connection, one
+            # SQL_BATCH of files at a time so only that batch's content is in
+            # memory; only the file writes, which don't touch it, run on the
+            # worker threads
+            restored, skipped = 0, 0
+            with ThreadPoolExecutor(max_workers=RESTORE_WORKERS) as pool:
+                for i in range(0, len(files), SQL_BATCH):
+                    batch = files[i : i + SQL_BATCH]
+                    snapshots = history_store.get_snapshots(batch, version)
+
+                    pending = []
+                    for fp in batch:
+                        snap = snapshots.pop(fp, None)
+                        if snap is None:
+                            if version is None:
+                                warning(f"  No history found for '{fp}' — skipped.")
+                            else:
+                                warning(f"  Version {version} not found for '{fp}' — skipped.")
+                            skipped += 1
+                            continue
+                        ver, content = snap
+                        pending.append((fp, ver, pool.submit(_write_file, project_root / Path(fp), content)))
+
+                    for fp, ver, write in pending:
+                        try:
+                            write.result()
+                        except Exception as e:
+                            warning(f"  Could not write '{fp}': {e} — skipped.")
+                            skipped += 1
+                            continue
+                        history_store.restore_to_version(fp, ver)
+                        success(f"  Restored '{fp}'")
+                        restored += 1
+
+            info(f"Done — {restored} restored, {skipped} skipped.")
+            return
+
+        # Single file restore
+        ok = _restore_single(history_store, project_root, norm_path, version, confirm_overwrite=not yes)
+
+        if ok:
+            ver_label = f"version {version}" if version is not None else "latest version"
+            success(f"Restored '{norm_path}' to {ver_label}.")
         else:
-            files = history_store.list_files_in_folder(norm_path)
-            scope_label = f"'{norm_path}/' ({len(files)} file(s))"
-
-        if not files:
-            history_store.close()
-            error("No tracked files found matching that path.")
             raise typer.Exit(1)
-
-        ver_label = f"version {version}" if version is not None else "latest version"
-        info(f"Restoring {scope_label} to {ver_label}.")
-
-        if not yes:
-            confirm = typer.confirm(
-                f"This will recreate {len(files)} file(s). Continue?", default=True,
-            )
-            if not confirm:
-                history_store.close()
-                info("Restore cancelled.")
-                raise typer.Exit(0)
-
-        restored, skipped = 0, 0
-        for fp in files:
-            ok = _restore_single(history_store, project_root, fp, version, confirm_overwrite=False)
-            if ok:
-                success(f"  Restored '{fp}'")
-                restored += 1
-            else:
-                skipped += 1
-
-        history_store.close()
-        info(f"Done — {restored} restored, {skipped} skipped.")
-        return
-
-    # Single file restore
-    ok = _restore_single(history_store, project_root, norm_path, version, confirm_overwrite=not yes)
-    history_store.close()
-
-    if ok:
-        ver_label = f"version {version}" if version is not None else "latest version"
-        success(f"Restored '{norm_path}' to {ver_label}.")
-    else:
-        raise typer.Exit(1)
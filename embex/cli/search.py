@@ -2,18 +2,61 @@
 embex search — search for code patterns (literal or regex) in the embedded codebase.
 """
 
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from typing import Optional
 import typer
 import re
 
 from embex.config import find_project_root, load_config, chroma_path
-from embex.core.vector_store import VectorStore
 from embex.utils.display import console, error
 
 from rich.table import Table
 from rich import box
 
 
+def _literal_matches(docs, needle):
+    """Yield (index, line number) of the first case-insensitive hit per document.
+
+    All documents are lowercased and joined once, so the scan is a few
+    C-level str.find calls instead of a Python-level test per document.
+    """
+    lowered = [doc.lower() if doc else "" for doc in docs]
+    buf = "\x00".join(lowered)
+    starts = list(accumulate((len(d) + 1 for d in lowered), initial=0))
+
+    pos = buf.find(needle)
+    while pos >= 0:
+        i = bisect_right(starts, pos) - 1
+        if pos + len(needle) < starts[i + 1]:
+            yield i, buf.count("\n", starts[i], pos)
+            pos = buf.find(needle, starts[i + 1])
+        else:
+            # Hit spans the separator into the next document
+            pos = buf.find(needle, pos + 1)
+
+
+def _regex_matches(docs, pat):
+    """Yield (index, line number) of the first regex hit per document.
+
+    The line comes from the match offset, so the pattern runs once per
+    document rather than again on each line. Newlines at the start of the
+    match are skipped, so the line is the one holding its first other
+    character.
+    """
+    for i, doc in enumerate(docs):
+        if not doc:
+            continue
+        match = pat.search(doc)
+        if match:
+            text = match.group()
+            body = text.lstrip("\n")
+            start = match.start() + (len(text) - len(body) if body else 0)
+            yield i, doc.count("\n", 0, start)
+
+
 def search_command(
     pattern: str = typer.Argument(..., help="Code pattern to search for."),
     folder: Optional[str] = typer.Option(None, "--folder", "-f", help="Limit search to a folder."),
@@ -21,6 +64,9 @@ def search_command(
     top_k: int = typer.Option(20, "--top-k", "-k", help="Max results to return."),
 ):
     """Search for a code pattern (literal or regex) in your codebase."""
+    # Deferred so that `embex --help` and other commands don't import chromadb
+    from embex.core.vector_store import VectorStore
+
     try:
         project_root = find_project_root()
     except FileNotFoundError:
@@ -28,7 +74,11 @@ def search_command(
         raise typer.Exit(1)
 
     vector_store = VectorStore(chroma_path(project_root))
-    collections = vector_store._client.list_collections()
+    by_folder = vector_store.collections_by_folder()
+    if folder:
+        targets = by_folder.get(folder, [])
+    else:
+        targets = [col for cols in by_folder.values() for col in cols]
 
     # Compile regex pattern if needed
     if regex:
@@ -43,50 +93,53 @@ def search_command(
     matches = []
     seen = set()
 
-    for col in collections:
-        col_folder = col.metadata.get("folder", "") if col.metadata else ""
-        if folder and col_folder != folder:
-            continue
-
-        try:
-            all_docs = col.get(include=["documents", "metadatas"])
-        except Exception:
-            continue
-
-        if not all_docs["documents"]:
-            continue
+    # Fetch collections concurrently (each get() is a separate disk read),
+    # but scan them in order so results stay deterministic. At most
+    # max_workers fetches are in flight, so only that many collections'
+    # documents are held in memory at once.
+    max_workers = max(1, min(8, len(targets)))
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    pending = iter(targets)
+    futures = deque()
+
+    def submit_next():
+        col = next(pending, None)
+        if col is not None:
+            futures.append(pool.submit(col.get, include=["documents", "metadatas"]))
+
+    for _ in range(max_workers):
+        submit_next()
+    try:
+        while futures and len(matches) < top_k:
+            future = futures.popleft()
+            submit_next()
+            try:
+                all_docs = future.result()
+            except Exception:
+                continue
+            del future
 
-        for doc, meta in zip(all_docs["documents"], all_docs["metadatas"]):
-            if not doc:
+            docs = all_docs.get("documents") or []
+            metas = all_docs.get("metadatas") or []
+            if not docs:
                 continue
 
-            # Check if the pattern matches
+            # Documents the pattern matches, with the matching line
             if pat:
-                match = pat.search(doc)
+                hits = _regex_matches(docs, pat)
             else:
-                match = pattern.lower() in doc.lower()
-
-            if match:
-                # Find the matching line and its line number
-                lines = doc.split("\n")
-                preview_line = ""
-                matched_offset = 0
-
-                for j, line in enumerate(lines):
-                    if pat:
-                        if pat.search(line):
-                            preview_line = line.strip()
-                            matched_offset = j
-                            break
-                    else:
-                        if pattern.lower() in line.lower():
-                            preview_line = line.strip()
-                            matched_offset = j
-                            break
+                hits = _literal_matches(docs, pattern.lower())
+
+            for i, line_no in hits:
+                doc, meta = docs[i], metas[i]
+                if not doc:
+                    continue
+
+                preview_line = doc.split("\n", line_no + 1)[line_no].strip()
 
                 start_line = meta.get("start_line")
                 if start_line is not None:
-                    abs_line = start_line + matched_offset
+                    abs_line = start_line + line_no
                     line_ref = f":{abs_line}"
                 else:
                     abs_line = 0
@@ -108,6 +161,11 @@ def search_command(
                 if len(matches) >= top_k:
                     break
 
+            # Drop this collection's documents before waiting on the next one
+            del all_docs, docs, metas, hits
+    finally:
+        pool.shutdown(cancel_futures=True)
+
     if not matches:
         console.print(f"[yellow]No matches found for: {pattern}[/yellow]")
         return
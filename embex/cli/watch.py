@@ -2,20 +2,22 @@
 embex watch — watches for file changes and re-embeds automatically.
 """
 
-import time
 import typer
-from watchdog.observers import Observer
 
 from embex.config import find_project_root, load_config, chroma_path, history_db_path
-from embex.core.embedder import Embedder
-from embex.core.vector_store import VectorStore
 from embex.core.history_store import HistoryStore
-from embex.core.watcher import EmbexEventHandler
 from embex.utils.display import success, error, info
 
 
 def watch_command():
     """Watch the project for file changes and re-embed automatically."""
+    # Heavy imports (watchdog, chromadb, sentence-transformers) are deferred
+    # so that `embex --help` and other commands don't pay for them.
+    from watchdog.observers import Observer
+    from embex.core.embedder import Embedder
+    from embex.core.vector_store import VectorStore
+    from embex.core.watcher import EmbexEventHandler
+
     try:
         project_root = find_project_root()
     except FileNotFoundError:
@@ -30,31 +32,35 @@ def watch_command():
         error(str(exc))
         raise typer.Exit(1)
 
-    vector_store = VectorStore(chroma_path(project_root))
-    history_store = HistoryStore(history_db_path(project_root))
+    vector_store = VectorStore(chroma_path(project_root), config.index)
 
-    handler = EmbexEventHandler(
-        project_root=project_root,
-        config=config,
-        embedder=embedder,
-        vector_store=vector_store,
-        history_store=history_store,
-    )
+    # Load the model now rather than on the first file change
+    embedder.warm_up()
 
-    observer = Observer()
-    observer.schedule(handler, str(project_root), recursive=True)
-    observer.start()
+    with HistoryStore(history_db_path(project_root)) as history_store:
+        handler = EmbexEventHandler(
+            project_root=project_root,
+            config=config,
+            embedder=embedder,
+            vector_store=vector_store,
+            history_store=history_store,
+        )
 
-    success(f"Watching [bold]{project_root}[/bold] for changes...")
-    info("Press Ctrl+C to stop.\n")
+        observer = Observer()
+        observer.schedule(handler, str(project_root), recursive=True)
+        observer.start()
+
+        success(f"Watching [bold]{project_root}[/bold] for changes...")
+        info("Press Ctrl+C to stop.\n")
+
+        # Changes are queued by the observer thread and processed here
+        try:
+            while True:
+                handler.process_pending(timeout=1.0)
+        except KeyboardInterrupt:
+            observer.stop()
+            info("\nStopping watcher...")
+
+        observer.join()
 
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        observer.stop()
-        info("\nStopping watcher...")
-
-    observer.join()
-    history_store.close()
     success("Watcher stopped.")
@@ -3,7 +3,11 @@ Configuration module for Embex.
 Handles loading, saving, and validating the embex.json config file.
 """
 
+import fnmatch
+import functools
 import json
+import os
+import re
 import time
 from pathlib import Path
 from typing import Optional
@@ -32,12 +36,38 @@ class WatchConfig(BaseModel):
         "*.test.*", "*.spec.*", "*.min.js",
     ])
 
+    # Matchers built once from the lists above, for should_ignore
+
+    @functools.cached_property
+    def exclude_dirs_set(self) -> frozenset:
+        return frozenset(self.exclude_dirs)
+
+    @functools.cached_property
+    def include_extensions_set(self) -> frozenset:
+        return frozenset(self.include_extensions)
+
+    @functools.cached_property
+    def exclude_files_re(self) -> Optional[re.Pattern]:
+        """All exclude_files globs as one regex (match os.path.normcase'd names), or None."""
+        if not self.exclude_files:
+            return None
+        return re.compile("|".join(
+            fnmatch.translate(os.path.normcase(p)) for p in self.exclude_files
+        ))
+
 
 class ChunkingConfig(BaseModel):
     chunk_size: int = 200
     overlap: int = 20
 
 
+class IndexConfig(BaseModel):
+    """HNSW settings for new collections (existing ones keep what they were built with)."""
+    hnsw_m: int = 16
+    construction_ef: int = 100
+    search_ef: int = 64
+
+
 class HistoryConfig(BaseModel):
     enabled: bool = True
     max_versions_per_file: int = 50
@@ -57,6 +87,7 @@ class EmbexConfig(BaseModel):
     llm: LLMConfig = Field(default_factory=LLMConfig)
     watch: WatchConfig = Field(default_factory=WatchConfig)
     chunking: ChunkingConfig = Field(default_factory=ChunkingConfig)
+    index: IndexConfig = Field(default_factory=IndexConfig)
     history: HistoryConfig = Field(default_factory=HistoryConfig)
 
 
@@ -66,6 +97,7 @@ EMBEX_DIR = ".embex"
 CONFIG_FILE = "embex.json"
 CHROMA_DIR = "chroma"
 HISTORY_DB = "history.db"
+CACHE_DB = "cache.db"
 
 
 # --- Helper Functions ---
@@ -90,6 +122,11 @@ def history_db_path(project_root: Path) -> Path:
     return embex_dir(project_root) / HISTORY_DB
 
 
+def cache_db_path(project_root: Path) -> Path:
+    """Get the SQLite response cache path."""
+    return embex_dir(project_root) / CACHE_DB
+
+
 def create_default_config(project_name: str) -> EmbexConfig:
     """Create a new config with default settings."""
     return EmbexConfig(project_name=project_name)
@@ -106,17 +143,34 @@ def write_config(project_root: Path, config: EmbexConfig) -> None:
 
 
 def load_config(project_root: Path) -> EmbexConfig:
-    """Load config from .embex/embex.json."""
+    """Load config from .embex/embex.json.
+
+    Results are memoized per path and modification time, so repeated loads
+    within one process skip parsing and validation until the file changes.
+    """
     path = config_path(project_root)
-    if not path.exists():
-        raise FileNotFoundError(f"No embex.json found at {path}. Run 'embex init' first.")
-    data = json.loads(path.read_text(encoding="utf-8"))
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No embex.json found at {path}. Run 'embex init' first.") from None
+    return _load_config_cached(str(path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int) -> EmbexConfig:
+    """Parse and validate embex.json (cached by load_config)."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
     return EmbexConfig(**data)
 
 
 def find_project_root(start: Optional[Path] = None) -> Path:
     """Walk up from start directory to find the .embex/ project root."""
-    current = (start or Path.cwd()).resolve()
+    return _find_project_root((start or Path.cwd()).resolve())
+
+
+@functools.lru_cache(maxsize=32)
+def _find_project_root(current: Path) -> Path:
+    """Walk up from a resolved directory (cached; misses raise and aren't cached)."""
     while True:
         if (current / EMBEX_DIR / CONFIG_FILE).exists():
             return current
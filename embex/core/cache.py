@@ -0,0 +1,100 @@
+"""
+Cache — content-addressed SQLite cache for LLM answers and query embeddings.
+Repeat `embex ask` / `embex explain --llm` calls over unchanged input resolve locally.
+"""
+
+import hashlib
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS cache (
+    key         TEXT    PRIMARY KEY,
+    value       BLOB    NOT NULL,
+    used_at     INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_used ON cache(used_at);
+"""
+
+# Least recently used entries beyond this count are evicted on write
+MAX_ENTRIES = 2000
+
+
+def cache_key(*parts):
+    """Hash the given parts, verbatim, into a cache key.
+
+    Whitespace is significant in code, so callers should only normalize
+    free text such as the user's question before passing it in.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """Small LRU key/value store kept in .embex/cache.db."""
+
+    def __init__(self, db_path, max_entries=MAX_ENTRIES):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(str(self.db_path))
+        # WAL lets explain's LLM worker and the main thread use cache.db at
+        # the same time, and makes each small commit cheaper
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA_SQL)
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def _get(self, key):
+        row = self.conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE cache SET used_at = ? WHERE key = ?", (int(time.time()), key))
+        self.conn.commit()
+        return row[0]
+
+    def _set(self, key, value):
+        self.conn.execute(
+            "INSERT INTO cache (key, value, used_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, used_at = excluded.used_at",
+            (key, value, int(time.time())),
+        )
+        self.conn.execute(
+            "DELETE FROM cache WHERE key IN "
+            "(SELECT key FROM cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.conn.commit()
+
+    def get_text(self, key):
+        """Return the cached string for key, or None."""
+        value = self._get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set_text(self, key, text):
+        """Store a string under key."""
+        self._set(key, text.encode("utf-8"))
+
+    def get_vector(self, key):
+        """Return the cached embedding for key as a list of floats, or None."""
+        value = self._get(key)
+        if value is None:
+            return None
+        vec = array("f")
+        vec.frombytes(value)
+        return vec.tolist()
+
+    def set_vector(self, key, vector):
+        """Store an embedding under key as packed float32."""
+        self._set(key, array("f", vector).tobytes())
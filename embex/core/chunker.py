@@ -12,8 +12,16 @@ def chunk_content(content, chunk_size=200, overlap=20):
     if not content or not content.strip():
         return []
 
-    lines = content.splitlines(keepends=True)
-    total = len(lines)
+    # Start offset of every line, plus the end of the content, so each chunk
+    # is one slice of the original string
+    offsets = [0]
+    pos = content.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = content.find("\n", pos + 1)
+    if offsets[-1] != len(content):
+        offsets.append(len(content))
+    total = len(offsets) - 1
 
     if total == 0:
         return []
@@ -25,14 +33,14 @@ def chunk_content(content, chunk_size=200, overlap=20):
 
     while start < total:
         end = min(start + chunk_size, total)
-        chunk_text = "".join(lines[start:end])
+        chunk_text = content[offsets[start]:offsets[end]]
         chunks.append((chunk_text, idx, start + 1, end))
         idx += 1
         start += step
 
         # Avoid tiny trailing chunk that's just overlap
         if start < total and (total - start) <= overlap:
-            chunk_text = "".join(lines[start:total])
+            chunk_text = content[offsets[start]:offsets[total]]
             chunks.append((chunk_text, idx, start + 1, total))
             break
 
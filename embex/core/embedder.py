@@ -3,17 +3,24 @@ Embedder — generates vector embeddings for text using either OpenAI API or a l
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from embex.core.cache import cache_key
 
 
 # Max batch size
 MAX_BATCH = 2048
 
+# Max OpenAI embedding requests in flight at once
+MAX_CONCURRENT_REQUESTS = 4
+
 
 class Embedder:
     """Generates embeddings using OpenAI or a local sentence-transformers model."""
 
-    def __init__(self, config):
+    def __init__(self, config, cache=None):
         self.provider = config.embedding.provider
+        self.cache = cache  # optional ResponseCache for embeddings
 
         if self.provider == "local":
             self._setup_local(config.embedding.model)
@@ -52,32 +59,79 @@ class Embedder:
         self.model_name = model_name
 
     def embed_texts(self, texts):
-        """Generate embeddings for a list of text strings."""
+        """Generate embeddings for a list of text strings.
+
+        With a cache attached, only texts that aren't cached yet are sent to
+        the provider, together in one batched call.
+        """
         if not texts:
             return []
 
+        if self.cache is None:
+            return self._embed(texts)
+
+        keys = [cache_key("embed", self.provider, self.model_name, text) for text in texts]
+        vectors = [self.cache.get_vector(key) for key in keys]
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            fresh = self._embed([texts[i] for i in missing])
+            for i, vec in zip(missing, fresh):
+                vectors[i] = vec
+                self.cache.set_vector(keys[i], vec)
+        return vectors
+
+    def warm_up(self):
+        """Run one throwaway local embedding so the first real one isn't slow.
+
+        The first encode pays for lazy weight loading and kernel selection.
+        No-op for OpenAI, where it would cost a billed request.
+        """
         if self.provider == "local":
-            return self._embed_local(texts)
-        return self._embed_openai(texts)
+            self._embed_local(["warmup"])
 
     def embed_query(self, query):
         """Embed a single query string and return its vector."""
         return self.embed_texts([query])[0]
 
+    def _embed(self, texts):
+        """Send texts to the configured provider in as few requests as possible."""
+        if self.provider == "local":
+            return self._embed_local(texts)
+        return self._embed_openai(texts)
+
     def _embed_openai(self, texts):
-        """Generate embeddings using OpenAI API."""
+        """Generate embeddings using OpenAI API.
+
+        Batches are sent concurrently (up to MAX_CONCURRENT_REQUESTS) and
+        reassembled in order.
+        """
+        batches = [texts[i : i + MAX_BATCH] for i in range(0, len(texts), MAX_BATCH)]
+        if len(batches) == 1:
+            return self._embed_openai_batch(batches[0])
+
         all_embeddings = []
-        for i in range(0, len(texts), MAX_BATCH):
-            batch = texts[i : i + MAX_BATCH]
-            response = self.client.embeddings.create(
-                input=batch,
-                model=self.model_name,
-            )
-            sorted_data = sorted(response.data, key=lambda d: d.index)
-            all_embeddings.extend([d.embedding for d in sorted_data])
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(batches))) as pool:
+            for embeddings in pool.map(self._embed_openai_batch, batches):
+                all_embeddings.extend(embeddings)
         return all_embeddings
 
+    def _embed_openai_batch(self, batch):
+        """Embed one batch of at most MAX_BATCH texts with a single request."""
+        response = self.client.embeddings.create(
+            input=batch,
+            model=self.model_name,
+        )
+        sorted_data = sorted(response.data, key=lambda d: d.index)
+        return [d.embedding for d in sorted_data]
+
     def _embed_local(self, texts):
-        """Generate embeddings using local sentence-transformers model."""
-        embeddings = self.local_model.encode(texts, show_progress_bar=False)
-        return [e.tolist() for e in embeddings]
+        """Generate embeddings using local sentence-transformers model.
+
+        Vectors are L2-normalized so cosine distance equals dot product. Rows
+        of the float32 array are returned as-is (no per-float Python objects);
+        ChromaDB accepts them directly.
+        """
+        embeddings = self.local_model.encode(
+            texts, show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return list(embeddings)
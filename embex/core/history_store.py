@@ -6,6 +6,7 @@ Stores full file snapshots so users can view and restore previous versions.
 import hashlib
 import sqlite3
 import time
+import zlib
 from pathlib import Path
 
 
@@ -41,9 +42,43 @@ CREATE TABLE IF NOT EXISTS embed_checksums (
 """
 
 
+# Bump when SCHEMA_SQL or _migrate changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Max file paths bound into one IN (...) query (SQLite caps host parameters)
+SQL_BATCH = 500
+
+# Embed checksum writes buffered before they're flushed in one transaction
+EMBED_FLUSH_EVERY = 256
+
+
 def _checksum(content):
-    """Calculate SHA-256 checksum of a string."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    """Calculate SHA-256 checksum of a string (UTF-8) or raw bytes."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def _file_checksum(f):
+    """Calculate SHA-256 checksum of a binary file object, without decoding it."""
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(1 << 16), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def _compress(data):
+    """Compress UTF-8 snapshot bytes for storage as a BLOB."""
+    return zlib.compress(data)
+
+
+def _decompress(stored):
+    """Decode stored snapshot content. Rows written before compression are plain TEXT."""
+    if isinstance(stored, bytes):
+        return zlib.decompress(stored).decode("utf-8")
+    return stored
 
 
 class HistoryStore:
@@ -54,33 +89,57 @@ class HistoryStore:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row
+        # WAL + NORMAL: per-file commits during a scan no longer fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate()
+
+        # Embed checksums, loaded on first use; writes are buffered
+        self._embed_checksums = None  # file_path -> (checksum, folder)
+        self._pending_embeds = []
+
+    def _migrate(self):
+        """Create or upgrade the schema, then record SCHEMA_VERSION."""
         self.conn.executescript(SCHEMA_SQL)
-        self.conn.commit()
 
         # Add folder column if it doesn't exist (for older databases)
         try:
             self.conn.execute(
                 "ALTER TABLE embed_checksums ADD COLUMN folder TEXT NOT NULL DEFAULT '.'"
             )
-            self.conn.commit()
-        except Exception:
+        except sqlite3.OperationalError:
             pass  # column already exists
 
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
     def close(self):
-        """Close the database connection."""
+        """Flush buffered writes and close the database connection."""
+        self._flush_embed_checksums()
         self.conn.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def snapshot_file(self, file_path, content, language="unknown", folder=".", message=None):
         """Save a new version of a file. Skips if content hasn't changed.
         Returns the version number.
         """
-        cs = _checksum(content)
+        data = content.encode("utf-8")
+        cs = _checksum(data)
         now = int(time.time())
         cur = self.conn.cursor()
 
-        # Check if we already track this file
+        # Check if we already track this file, and the checksum of its current version
         cur.execute(
-            "SELECT current_version FROM file_registry WHERE file_path = ?",
+            "SELECT r.current_version, s.checksum FROM file_registry r "
+            "LEFT JOIN snapshots s ON s.file_path = r.file_path AND s.version = r.current_version "
+            "WHERE r.file_path = ?",
             (file_path,),
         )
         row = cur.fetchone()
@@ -88,12 +147,7 @@ class HistoryStore:
         if row is not None:
             current_version = row["current_version"]
             # Check if content actually changed
-            cur.execute(
-                "SELECT checksum FROM snapshots WHERE file_path = ? AND version = ?",
-                (file_path, current_version),
-            )
-            snap = cur.fetchone()
-            if snap and snap["checksum"] == cs:
+            if row["checksum"] == cs:
                 return current_version  # no change
 
             new_version = current_version + 1
@@ -112,7 +166,7 @@ class HistoryStore:
         cur.execute(
             "INSERT INTO snapshots (file_path, version, content, timestamp, checksum, message) "
             "VALUES (?, ?, ?, ?, ?, ?)",
-            (file_path, new_version, content, now, cs, message),
+            (file_path, new_version, _compress(data), now, cs, message),
         )
         self.conn.commit()
         return new_version
@@ -132,7 +186,36 @@ class HistoryStore:
             (file_path, version),
         )
         row = cur.fetchone()
-        return row["content"] if row else None
+        return _decompress(row["content"]) if row else None
+
+    def get_snapshots(self, file_paths, version=None):
+        """Fetch snapshots for many files at once.
+
+        With version=None each file's current version is used. Returns a dict
+        of file_path -> (version, content); files without a matching snapshot
+        are left out.
+        """
+        snapshots = {}
+        for i in range(0, len(file_paths), SQL_BATCH):
+            batch = file_paths[i : i + SQL_BATCH]
+            marks = ",".join("?" * len(batch))
+            if version is None:
+                cur = self.conn.execute(
+                    "SELECT r.file_path, r.current_version AS version, s.content "
+                    "FROM file_registry r JOIN snapshots s "
+                    "ON s.file_path = r.file_path AND s.version = r.current_version "
+                    f"WHERE r.file_path IN ({marks})",
+                    batch,
+                )
+            else:
+                cur = self.conn.execute(
+                    "SELECT file_path, version, content FROM snapshots "
+                    f"WHERE version = ? AND file_path IN ({marks})",
+                    [version, *batch],
+                )
+            for row in cur:
+                snapshots[row["file_path"]] = (row["version"], _decompress(row["content"]))
+        return snapshots
 
     def get_latest_version(self, file_path):
         """Get the current version number (0 if file is not tracked)."""
@@ -145,10 +228,14 @@ class HistoryStore:
 
     def get_latest_content(self, file_path):
         """Get the content of the latest version. Returns None if not tracked."""
-        version = self.get_latest_version(file_path)
-        if version == 0:
-            return None
-        return self.get_snapshot(file_path, version)
+        cur = self.conn.execute(
+            "SELECT s.content FROM file_registry r JOIN snapshots s "
+            "ON s.file_path = r.file_path AND s.version = r.current_version "
+            "WHERE r.file_path = ?",
+            (file_path,),
+        )
+        row = cur.fetchone()
+        return _decompress(row["content"]) if row else None
 
     def restore_to_version(self, file_path, version):
         """Set the current version pointer to a specific version (used after restore).
@@ -177,44 +264,74 @@ class HistoryStore:
 
     def list_files_in_folder(self, folder_prefix):
         """Get all file paths that start with the given folder prefix."""
-        prefix = folder_prefix.rstrip("/") + "/"
+        # A range on the primary key instead of LIKE, so SQLite can seek the
+        # index ('0' is the character right after '/')
+        prefix = folder_prefix.rstrip("/")
         cur = self.conn.execute(
-            "SELECT file_path FROM file_registry WHERE file_path LIKE ? ORDER BY file_path",
-            (prefix + "%",),
+            "SELECT file_path FROM file_registry WHERE file_path >= ? AND file_path < ? ORDER BY file_path",
+            (prefix + "/", prefix + "0"),
         )
         return [row["file_path"] for row in cur.fetchall()]
 
-    def get_embed_checksum(self, file_path):
-        """Get the checksum of the last embedded version. Returns None if never embedded."""
-        cur = self.conn.execute(
-            "SELECT checksum FROM embed_checksums WHERE file_path = ?",
-            (file_path,),
-        )
-        row = cur.fetchone()
-        return row["checksum"] if row else None
+    def _embeds(self):
+        """Load all embed checksums into memory with one query (first call only)."""
+        if self._embed_checksums is None:
+            cur = self.conn.execute("SELECT file_path, checksum, folder FROM embed_checksums")
+            self._embed_checksums = {
+                row["file_path"]: (row["checksum"], row["folder"]) for row in cur
+            }
+        return self._embed_checksums
 
-    def set_embed_checksum(self, file_path, checksum, folder="."):
-        """Record the checksum of the version just embedded."""
-        now = int(time.time())
-        self.conn.execute(
+    def _flush_embed_checksums(self):
+        """Write buffered embed checksums in a single transaction."""
+        if not self._pending_embeds:
+            return
+        self.conn.executemany(
             "INSERT INTO embed_checksums (file_path, checksum, embedded_at, folder) "
             "VALUES (?, ?, ?, ?) "
             "ON CONFLICT(file_path) DO UPDATE SET checksum = excluded.checksum, "
             "embedded_at = excluded.embedded_at, folder = excluded.folder",
-            (file_path, checksum, now, folder),
+            self._pending_embeds,
         )
         self.conn.commit()
+        self._pending_embeds = []
+
+    def flush(self):
+        """Write buffered embed checksums now (long-running callers flush per batch)."""
+        self._flush_embed_checksums()
+
+    def get_embed_checksum(self, file_path):
+        """Get the checksum of the last embedded version. Returns None if never embedded."""
+        entry = self._embeds().get(file_path)
+        return entry[0] if entry else None
+
+    def set_embed_checksum(self, file_path, checksum, folder="."):
+        """Record the checksum of the version just embedded.
+
+        The write is buffered and flushed every EMBED_FLUSH_EVERY calls, on
+        flush() and on close().
+        """
+        self._embeds()[file_path] = (checksum, folder)
+        self._pending_embeds.append((file_path, checksum, int(time.time()), folder))
+        if len(self._pending_embeds) >= EMBED_FLUSH_EVERY:
+            self._flush_embed_checksums()
 
     def get_all_embed_paths(self):
         """Get all (file_path, folder) pairs that have been embedded."""
-        cur = self.conn.execute(
-            "SELECT file_path, folder FROM embed_checksums ORDER BY file_path"
-        )
-        return [(row["file_path"], row["folder"]) for row in cur.fetchall()]
+        return sorted((path, folder) for path, (_, folder) in self._embeds().items())
 
     def delete_embed_checksum(self, file_path):
         """Remove the embed record for a file (when it's deleted)."""
-        self.conn.execute(
-            "DELETE FROM embed_checksums WHERE file_path = ?", (file_path,)
+        self.delete_embed_checksums([file_path])
+
+    def delete_embed_checksums(self, file_paths):
+        """Remove the embed records for many files in one transaction."""
+        self._flush_embed_checksums()
+        embeds = self._embeds()
+        for file_path in file_paths:
+            embeds.pop(file_path, None)
+        self.conn.executemany(
+            "DELETE FROM embed_checksums WHERE file_path = ?",
+            [(file_path,) for file_path in file_paths],
         )
         self.conn.commit()
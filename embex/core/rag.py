@@ -8,17 +8,31 @@ How it works:
   4. Return the LLM's answer with source citations
 """
 
+import functools
 import os
+from pathlib import Path
+
+from embex.core.cache import cache_key
 
 
 # Default settings
-RELEVANCE_THRESHOLD = 0.30  # minimum similarity score to count as relevant
+RELEVANCE_THRESHOLD = 0.25  # minimum similarity score to count as relevant
 MAX_CHUNK_CHARS = 1200      # max characters per chunk to send to LLM
+ZAI_BASE_URL = "https://api.z.ai/api/paas/v4/"
+
+_env_loaded = False
 
 
-def ask(question, config, embedder, vector_store, top_k=8, folder=None, relevance_threshold=None):
+def ask(question, config, embedder, vector_store, top_k=8, folder=None, relevance_threshold=None,
+        cache=None, stream=False):
     """Run the RAG pipeline: retrieve chunks, filter, generate answer.
-    
+
+    If a ResponseCache is given, the answer for an identical question over
+    identical retrieved context is reused instead of calling the LLM.
+
+    With stream=True, "answer" is an iterator of text fragments as the LLM
+    produces them; the full text is cached once the iterator is exhausted.
+
     Returns a dict with: answer, sources, relevant_count, total_retrieved.
     """
     threshold = relevance_threshold if relevance_threshold is not None else RELEVANCE_THRESHOLD
@@ -56,8 +70,21 @@ def ask(question, config, embedder, vector_store, top_k=8, folder=None, relevanc
 
     context_str = "\n\n".join(context_parts) if context_parts else "(No code chunks retrieved.)"
 
-    # Step 4: Call the LLM to generate an answer
-    answer = _call_llm(question, context_str, config)
+    # Step 4: Call the LLM to generate an answer (or reuse a cached one)
+    # Collapse whitespace in the question only; the code context is hashed as-is
+    key = cache_key("llm", config.llm.model, SYSTEM_PROMPT, context_str, " ".join(question.split()))
+    answer = cache.get_text(key) if cache is not None else None
+    if answer is not None:
+        if stream:
+            answer = iter([answer])
+    elif stream:
+        answer = _call_llm(question, context_str, config, stream=True)
+        if cache is not None:
+            answer = _cache_stream(answer, cache, key)
+    else:
+        answer = _call_llm(question, context_str, config)
+        if cache is not None and answer:
+            cache.set_text(key, answer)
 
     return {
         "answer": answer,
@@ -83,50 +110,90 @@ Rules:
 """
 
 
-def _call_llm(question, context, config):
-    """Call the z.ai LLM API to generate an answer."""
-    # Load environment variables
+def load_env():
+    """Load .env files into the environment (once per process)."""
+    global _env_loaded
+    if _env_loaded:
+        return
     try:
         from dotenv import load_dotenv
-        from pathlib import Path
         load_dotenv()
         load_dotenv(dotenv_path=Path.home() / ".embex" / ".env", override=False)
     except ImportError:
         pass
+    _env_loaded = True
 
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key, base_url):
+    """Create (once per key and endpoint) an OpenAI-compatible client, reusing its connections."""
     from openai import OpenAI
 
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+def _call_llm(question, context, config, stream=False):
+    """Call the z.ai LLM API to generate an answer.
+
+    Returns the answer text, or an iterator of text fragments if stream is True.
+    """
+    load_env()
+
     api_key = os.environ.get(config.llm.api_key_env)
     if not api_key:
         raise EnvironmentError(
             f"API key not set. Set the '{config.llm.api_key_env}' environment variable."
         )
 
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.z.ai/api/paas/v4/",
+    user_prompt = (
+        f"Here are the relevant code chunks from the project:\n\n"
+        f"{context}\n\n"
+        f"---\n\n"
+        f"Question: {question}"
     )
+    return complete(SYSTEM_PROMPT, user_prompt, config.llm.model or "glm-4.7-flash", api_key, stream=stream)
+
 
-    messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {
-            "role": "user",
-            "content": (
-                f"Here are the relevant code chunks from the project:\n\n"
-                f"{context}\n\n"
-                f"---\n\n"
-                f"Question: {question}"
-            ),
-        },
-    ]
+def complete(system_prompt, user_prompt, model, api_key, max_tokens=2048, stream=False):
+    """Send one system + user prompt to the z.ai chat API.
+
+    Shared by `ask` and `explain --llm`. Returns the reply text, or an
+    iterator of text fragments if stream is True.
+    """
+    client = _get_client(api_key, ZAI_BASE_URL)
 
     response = client.chat.completions.create(
-        model=config.llm.model or "glm-4.7-flash",
-        messages=messages,
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
         extra_body={"thinking": {"type": "disabled"}},
         temperature=0.7,
-        max_tokens=2048,
+        max_tokens=max_tokens,
+        stream=stream,
     )
 
+    if stream:
+        return _iter_stream(response)
+
     msg = response.choices[0].message
     return msg.content or getattr(msg, "reasoning_content", None) or ""
+
+
+def _iter_stream(response):
+    """Yield the text fragments of a streaming chat completion."""
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _cache_stream(fragments, cache, key):
+    """Pass fragments through, then cache the full answer once complete."""
+    parts = []
+    for text in fragments:
+        parts.append(text)
+        yield text
+    answer = "".join(parts)
+    if answer:
+        cache.set_text(key, answer)
@@ -2,25 +2,106 @@
 Scanner — scans the project directory, chunks files, embeds them, and stores in ChromaDB.
 """
 
-import hashlib
+import itertools
+import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
 
 from embex.core.chunker import chunk_content
-from embex.utils.ignore import should_ignore, get_relative_path, get_folder
+from embex.core.history_store import _file_checksum
+from embex.utils.ignore import should_ignore, should_ignore_rel, get_relative_path
 from embex.utils.language import detect_language
 from embex.utils.display import success, error, info
 
 
+# Chunks buffered per folder before they're written to ChromaDB together
+UPSERT_BATCH = 200
+
+# Files whose embeddings may be computing ahead of the ChromaDB writes
+EMBED_AHEAD = 8
+
+# Recently embedded chunk texts remembered for reuse within one scan
+SEEN_CHUNKS_MAX = 4096
+
+
+def _decode(data):
+    """Decode file bytes the way read_text(encoding="utf-8", errors="replace") would."""
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _embed_missing(embedder, texts, known, seen):
+    """Embed texts, reusing vectors for any text already embedded.
+
+    known maps the file's previously stored chunk texts to their vectors;
+    seen holds chunks embedded earlier in this scan, so boilerplate repeated
+    across files (license headers, generated code) is embedded once. Only
+    the embed worker touches seen.
+    """
+    missing = list(dict.fromkeys(text for text in texts if text not in known and text not in seen))
+    if missing:
+        for text, vec in zip(missing, embedder.embed_texts(missing)):
+            seen[text] = vec
+    vectors = [known[text] if text in known else seen[text] for text in texts]
+
+    # Drop the oldest entries once the scan-wide map is full
+    for text in list(itertools.islice(seen, max(0, len(seen) - SEEN_CHUNKS_MAX))):
+        del seen[text]
+    return vectors
+
+
+def _flush_folder(vector_store, history_store, folder, batch):
+    """Write one folder's buffered files to ChromaDB, then record their checksums.
+
+    batch is a list of (rel_path, checksum, upsert_args) entries. Returns
+    (chunks_created, files_failed).
+    """
+    try:
+        n = vector_store.upsert_files(folder, [args for _, _, args in batch])
+    except Exception as exc:
+        error(f"Failed to store {len(batch)} file(s) in '{folder}': {exc}")
+        return 0, len(batch)
+
+    # Only now are the files safely stored; record checksums so unchanged
+    # files are skipped next time
+    for rel_path, checksum, _ in batch:
+        history_store.set_embed_checksum(rel_path, checksum, folder)
+    return n, 0
+
+
 def _collect_files(project_root, config):
-    """Walk the project and return all files that should be processed."""
+    """Walk the project and return (path, rel_path) for every file to process.
+
+    Excluded directories are pruned before descending into them, and
+    directory symlinks are not followed. Relative paths are built from the
+    walk itself; only symlinked files are resolved, since they may point
+    outside the project.
+    """
+    exclude_dirs = config.watch.exclude_dirs_set
     files = []
-    for path in project_root.rglob("*"):
-        if path.is_file() and not should_ignore(path, project_root, config):
-            files.append(path)
-    return sorted(files)
+    stack = [(os.fspath(project_root), "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in exclude_dirs:
+                            stack.append((entry.path, prefix + entry.name + "/"))
+                    elif not entry.is_file():
+                        continue
+                    elif entry.is_symlink():
+                        if not should_ignore(entry.path, project_root, config):
+                            files.append((entry.path, get_relative_path(entry.path, project_root)))
+                    elif not should_ignore_rel(prefix + entry.name, config):
+                        files.append((entry.path, prefix + entry.name))
+        except OSError:
+            continue  # unreadable directory
+    files.sort()
+    return [(Path(path), rel_path) for path, rel_path in files]
 
 
 def scan_project(project_root, config, embedder, vector_store, history_store):
@@ -39,38 +120,79 @@ def scan_project(project_root, config, embedder, vector_store, history_store):
         return {"files_processed": 0, "chunks_created": 0, "errors": 0, "files_skipped": 0, "files_removed": 0}
 
     # Remove vectors for files that were deleted from disk since last scan
-    current_rel_paths = {get_relative_path(f, project_root) for f in files}
+    current_rel_paths = {rel_path for _, rel_path in files}
+    removed = []
     for stored_path, stored_folder in history_store.get_all_embed_paths():
         if stored_path not in current_rel_paths:
             vector_store.delete_file(stored_path, stored_folder)
-            history_store.delete_embed_checksum(stored_path)
-            removed_count += 1
+            removed.append(stored_path)
+    if removed:
+        history_store.delete_embed_checksums(removed)
+        removed_count = len(removed)
+
+    # Collections from older versions use L2 distance; rebuild them as cosine
+    legacy = vector_store.drop_legacy_collections()
+    if legacy:
+        info(f"Rebuilding {len(legacy)} index collection(s) for cosine scoring.")
+        history_store.delete_embed_checksums([
+            stored_path
+            for stored_path, stored_folder in history_store.get_all_embed_paths()
+            if stored_folder in legacy
+        ])
 
     info(f"Found {len(files)} file(s) to process.")
 
+    pending = {}  # folder -> buffered files awaiting one batched upsert
+    pending_chunks = {}  # folder -> chunk count in that buffer
+    in_flight = deque()  # files whose embeddings are being computed, in order
+    seen = {}  # chunk text -> embedding, for duplicates across files
+
+    def collect(entry):
+        """Wait for one file's embeddings and queue it for its folder's upsert.
+
+        Returns (chunks_created, files_failed) from any flush this triggers.
+        """
+        rel_path, folder, checksum, chunk_texts, metadata_base, chunk_line_metas, future = entry
+        try:
+            embeddings = future.result()
+        except Exception as exc:
+            error(f"Failed to process {rel_path}: {exc}")
+            return 0, 1
+
+        pending.setdefault(folder, []).append(
+            (rel_path, checksum, (rel_path, chunk_texts, embeddings, metadata_base, chunk_line_metas))
+        )
+        pending_chunks[folder] = pending_chunks.get(folder, 0) + len(chunk_texts)
+
+        if pending_chunks[folder] < UPSERT_BATCH:
+            return 0, 0
+        del pending_chunks[folder]
+        return _flush_folder(vector_store, history_store, folder, pending.pop(folder))
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[bold blue]{task.description}"),
         BarColumn(),
         MofNCompleteColumn(),
         TimeElapsedColumn(),
-    ) as progress:
+    ) as progress, ThreadPoolExecutor(max_workers=1) as embed_pool:
         task = progress.add_task("Embedding files...", total=len(files))
 
-        for file_path in files:
-            rel_path = get_relative_path(file_path, project_root)
-            folder = get_folder(file_path, project_root)
+        for file_path, rel_path in files:
+            folder = rel_path.rpartition("/")[0] or "."
             language = detect_language(file_path)
 
             try:
-                content = file_path.read_text(encoding="utf-8", errors="replace")
-                checksum = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                with open(file_path, "rb") as f:
+                    # Hash the raw bytes; skip if file hasn't changed since last embed
+                    checksum = _file_checksum(f)
+                    if history_store.get_embed_checksum(rel_path) == checksum:
+                        skipped_count += 1
+                        progress.advance(task)
+                        continue
 
-                # Skip if file hasn't changed since last embed
-                if history_store.get_embed_checksum(rel_path) == checksum:
-                    skipped_count += 1
-                    progress.advance(task)
-                    continue
+                    f.seek(0)
+                    content = _decode(f.read())
 
                 # Save snapshot to history
                 if config.history.enabled:
@@ -98,10 +220,6 @@ def scan_project(project_root, config, embedder, vector_store, history_store):
                     for _, _, s, e in raw_chunks
                 ]
 
-                # Generate embeddings
-                embeddings = embedder.embed_texts(chunk_texts)
-
-                # Store in ChromaDB
                 metadata_base = {
                     "file_path": rel_path,
                     "folder": folder,
@@ -110,25 +228,42 @@ def scan_project(project_root, config, embedder, vector_store, history_store):
                     "project_root": str(project_root),
                 }
 
-                n = vector_store.upsert_file(
-                    file_path=rel_path,
-                    folder=folder,
-                    chunks=chunk_texts,
-                    embeddings=embeddings,
-                    metadata_base=metadata_base,
-                    chunk_metadatas=chunk_line_metas,
-                )
-                total_chunks += n
+                # A changed file keeps most of its chunks; reuse their stored
+                # embeddings and only embed the chunks whose text is new
+                known = {}
+                if history_store.get_embed_checksum(rel_path) is not None:
+                    known = vector_store.get_chunk_embeddings(rel_path, folder)
 
-                # Save checksum so we can skip unchanged files next time
-                history_store.set_embed_checksum(rel_path, checksum, folder)
+                # Generate embeddings on the worker while this thread moves on
+                # to reading, snapshotting and writing the next files
+                in_flight.append((
+                    rel_path, folder, checksum, chunk_texts, metadata_base, chunk_line_metas,
+                    embed_pool.submit(_embed_missing, embedder, chunk_texts, known, seen),
+                ))
 
             except Exception as exc:
                 error(f"Failed to process {rel_path}: {exc}")
                 errors_count += 1
+                progress.advance(task)
+                continue
+
+            if len(in_flight) >= EMBED_AHEAD:
+                n, failed = collect(in_flight.popleft())
+                total_chunks += n
+                errors_count += failed
+                progress.advance(task)
 
+        while in_flight:
+            n, failed = collect(in_flight.popleft())
+            total_chunks += n
+            errors_count += failed
             progress.advance(task)
 
+        for folder, batch in pending.items():
+            n, failed = _flush_folder(vector_store, history_store, folder, batch)
+            total_chunks += n
+            errors_count += failed
+
     return {
         "files_processed": len(files) - errors_count - skipped_count,
         "chunks_created": total_chunks,
@@ -2,15 +2,32 @@
 VectorStore — stores and queries code embeddings using ChromaDB.
 """
 
+import functools
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import chromadb
 
+from embex.config import IndexConfig
+from embex.utils.compat import apply_chromadb_compat
 
+
+# Max chunks per collection.add call
+ADD_BATCH = 128
+
+# Max collections queried at once when searching every folder
+QUERY_WORKERS = 8
+
+
+# Path separators -> underscores, in one pass
+_SEPARATORS = str.maketrans({"/": "_", "\\": "_"})
+
+
+@functools.lru_cache(maxsize=1024)
 def _collection_name(folder):
     """Convert a folder path to a valid ChromaDB collection name."""
     if folder in (".", "", "/"):
         return "root"
-    name = folder.replace("/", "_").replace("\\", "_")
+    name = folder.translate(_SEPARATORS)
     name = name.strip("_-.")
     if len(name) < 3:
         name = name + "_col"
@@ -19,112 +36,298 @@ def _collection_name(folder):
     return name
 
 
+def _similarity(dist, space):
+    """Convert a ChromaDB distance to cosine similarity (higher = better).
+
+    For the squared L2 distance used by older collections cos = 1 - d/2,
+    which only holds for unit-length vectors; scan_project rebuilds those
+    collections, so this is a stopgap until the next `embex init`.
+    """
+    if space == "l2":
+        return 1.0 - dist / 2.0
+    return 1.0 - dist  # cosine and ip both report 1 - similarity
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(chroma_dir):
+    """Open (once per process) the persistent ChromaDB client for a directory."""
+    # chromadb is slow to import; only pay for it when a store is opened
+    apply_chromadb_compat()
+    import chromadb
+
+    return chromadb.PersistentClient(path=chroma_dir)
+
+
 class VectorStore:
     """Wrapper around ChromaDB for storing and searching code chunk embeddings."""
 
-    def __init__(self, chroma_dir):
+    def __init__(self, chroma_dir, index=None):
         self.chroma_dir = Path(chroma_dir)
+        self.index = index or IndexConfig()
         self.chroma_dir.mkdir(parents=True, exist_ok=True)
-        self._client = chromadb.PersistentClient(path=str(self.chroma_dir))
+        self._client = _get_client(str(self.chroma_dir.resolve()))
+        self._collections = {}  # folder -> Collection handle
+        self._counts = {}  # collection name -> chunk count, dropped on writes
 
     def get_or_create_collection(self, folder):
-        """Get or create a ChromaDB collection for the given folder."""
-        name = _collection_name(folder)
-        return self._client.get_or_create_collection(
-            name=name,
-            metadata={"folder": folder},
-        )
+        """Get or create a ChromaDB collection for the given folder.
+
+        New collections use cosine distance and the HNSW settings from
+        self.index. Existing ones are opened as-is, since a collection's
+        distance function and graph parameters can't be changed after creation.
+        """
+        collection = self._collections.get(folder)
+        if collection is None:
+            name = _collection_name(folder)
+            try:
+                collection = self._client.get_collection(name=name)
+            except Exception:
+                collection = self._client.get_or_create_collection(
+                    name=name,
+                    metadata={
+                        "folder": folder,
+                        "hnsw:space": "cosine",
+                        "hnsw:M": self.index.hnsw_m,
+                        "hnsw:construction_ef": self.index.construction_ef,
+                        "hnsw:search_ef": self.index.search_ef,
+                    },
+                )
+            self._collections[folder] = collection
+        return collection
+
+    def _existing_collection(self, folder):
+        """Get the collection for a folder without creating it (raises if missing)."""
+        collection = self._collections.get(folder)
+        if collection is None:
+            collection = self._client.get_collection(name=_collection_name(folder))
+            self._collections[folder] = collection
+        return collection
+
+    def _count(self, collection):
+        """Number of chunks in a collection, cached until the next write to it."""
+        count = self._counts.get(collection.name)
+        if count is None:
+            count = self._counts[collection.name] = collection.count()
+        return count
+
+    def collections_by_folder(self):
+        """Group the existing collections by the folder they index."""
+        by_folder = {}
+        for col in self._client.list_collections():
+            folder = col.metadata.get("folder", "") if col.metadata else ""
+            by_folder.setdefault(folder, []).append(col)
+        return by_folder
+
+    def drop_legacy_collections(self):
+        """Delete collections not using cosine distance; return their folders.
+
+        Older versions created L2 collections and may have stored vectors
+        that were not normalized, so their scores aren't comparable to
+        cosine ones. The caller re-embeds the returned folders.
+        """
+        folders = set()
+        for col in self._client.list_collections():
+            metadata = col.metadata or {}
+            if metadata.get("hnsw:space", "l2") != "cosine":
+                self._client.delete_collection(name=col.name)
+                folders.add(metadata.get("folder", ""))
+        if folders:
+            self._collections.clear()
+            self._counts.clear()
+        return folders
 
     def upsert_file(self, file_path, folder, chunks, embeddings, metadata_base, chunk_metadatas=None):
         """Delete old chunks for a file and insert new ones. Returns number of chunks inserted."""
-        collection = self.get_or_create_collection(folder)
+        return self.upsert_files(folder, [(file_path, chunks, embeddings, metadata_base, chunk_metadatas)])
 
-        # Remove existing chunks for this file first
-        self.delete_file(file_path, folder)
+    def upsert_files(self, folder, files, batch_size=ADD_BATCH):
+        """Replace the chunks of several files in one folder.
 
-        if not chunks:
-            return 0
+        files is a list of (file_path, chunks, embeddings, metadata_base,
+        chunk_metadatas) tuples. Chunks are added batch_size at a time.
+        Returns number of chunks inserted.
+        """
+        collection = self.get_or_create_collection(folder)
+
+        # Remove existing chunks for these files first
+        self._delete_paths(collection, [f[0] for f in files])
 
         ids = []
         documents = []
         metadatas = []
         embeds = []
 
-        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-            doc_id = f"{file_path}::{i}"
-            meta = {
-                **metadata_base,
-                "chunk_index": i,
-                "total_chunks": len(chunks),
-            }
-            if chunk_metadatas and i < len(chunk_metadatas):
-                meta.update(chunk_metadatas[i])
-            ids.append(doc_id)
-            documents.append(chunk_text)
-            metadatas.append(meta)
-            embeds.append(embedding)
-
-        collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeds,
-            metadatas=metadatas,
-        )
+        for file_path, chunks, embeddings, metadata_base, chunk_metadatas in files:
+            n = len(chunks)
+            extra = chunk_metadatas or ()
+            ids.extend([f"{file_path}::{i}" for i in range(n)])
+            documents.extend(chunks)
+            embeds.extend(embeddings)
+            metadatas.extend([
+                {
+                    **metadata_base,
+                    "chunk_index": i,
+                    "total_chunks": n,
+                    **(extra[i] if i < len(extra) else {}),
+                }
+                for i in range(n)
+            ])
+
+        self._counts.pop(collection.name, None)
+
+        # Add in slices, keeping each call (one ChromaDB transaction) small
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            collection.add(
+                ids=ids[start:end],
+                documents=documents[start:end],
+                embeddings=embeds[start:end],
+                metadatas=metadatas[start:end],
+            )
         return len(ids)
 
     def delete_file(self, file_path, folder):
         """Remove all chunks for a file from its collection."""
-        collection = self.get_or_create_collection(folder)
+        self._delete_paths(self.get_or_create_collection(folder), [file_path])
+
+    def _delete_paths(self, collection, file_paths):
+        """Remove all chunks for the given files from a collection."""
+        where = {"file_path": file_paths[0]} if len(file_paths) == 1 else {"file_path": {"$in": file_paths}}
+        self._counts.pop(collection.name, None)
         try:
-            existing = collection.get(where={"file_path": file_path})
-            if existing["ids"]:
-                collection.delete(ids=existing["ids"])
+            collection.delete(where=where)
         except Exception:
             pass  # collection might be empty
 
-    def query(self, query_embedding, folder=None, top_k=5):
-        """Search for the most similar chunks. Returns a list of result dicts."""
-        results = []
+    def get_chunk_embeddings(self, file_path, folder):
+        """Return the stored chunks of a file as a dict of chunk text -> embedding."""
+        try:
+            collection = self._existing_collection(folder)
+            existing = collection.get(
+                where={"file_path": file_path},
+                include=["documents", "embeddings"],
+            )
+        except Exception:
+            return {}
+        documents = existing.get("documents") or []
+        embeddings = existing.get("embeddings")
+        if embeddings is None:
+            return {}
+        return dict(zip(documents, embeddings))
+
+    def get_file_embedding(self, file_path, folder):
+        """Return the stored embedding of a file's first chunk, or None if not indexed."""
+        try:
+            collection = self._existing_collection(folder)
+            existing = collection.get(
+                where={"$and": [{"file_path": file_path}, {"chunk_index": 0}]},
+                include=["embeddings"],
+                limit=1,
+            )
+        except Exception:
+            return None
+        embeddings = existing.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        return list(embeddings[0])
+
+    def query(self, query_embedding, folder=None, top_k=5, exclude_file=None):
+        """Search for the most similar chunks. Returns a list of result dicts.
+
+        exclude_file leaves that file's own chunks out of the results. When
+        several collections are searched, they're queried concurrently for
+        ids and scores only, and chunk text is fetched just for the top_k
+        that survive the merge.
+        """
+        where = {"file_path": {"$ne": exclude_file}} if exclude_file else None
 
         if folder:
             collections = [self.get_or_create_collection(folder)]
         else:
             collections = self._client.list_collections()
 
-        for col in collections:
-            try:
-                count = col.count()
-                if count == 0:
-                    continue
-                n = min(top_k, count)
-                res = col.query(
-                    query_embeddings=[query_embedding],
-                    n_results=n,
-                    include=["documents", "metadatas", "distances"],
-                )
-            except Exception:
-                continue
+        with_documents = len(collections) <= 1
 
-            if not res["ids"] or not res["ids"][0]:
-                continue
+        def search(col):
+            return self._query_collection(col, query_embedding, top_k, where, with_documents)
 
-            for doc_id, doc, meta, dist in zip(
-                res["ids"][0],
-                res["documents"][0],
-                res["metadatas"][0],
-                res["distances"][0],
-            ):
-                # Convert L2 distance to similarity score (0-1, higher = better)
-                score = 1.0 / (1.0 + dist)
-                results.append({
+        if with_documents:
+            per_collection = [search(col) for col in collections]
+        else:
+            with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(collections))) as pool:
+                per_collection = list(pool.map(search, collections))
+
+        # Best top_k matches across all collections, highest score first
+        top = heapq.nlargest(
+            top_k,
+            (hit for hits in per_collection for hit in hits),
+            key=lambda hit: hit[0]["score"],
+        )
+        if not with_documents:
+            self._fill_previews(top)
+        return [result for result, _, _ in top]
+
+    def _query_collection(self, col, query_embedding, top_k, where, with_documents):
+        """Query one collection.
+
+        Returns (result, collection, id) hits ([] if empty or on error). Without
+        with_documents, each result's preview is left for _fill_previews.
+        """
+        include = ["metadatas", "distances"]
+        if with_documents:
+            include.append("documents")
+        try:
+            count = self._count(col)
+            if count == 0:
+                return []
+            n = min(top_k, count)
+            res = col.query(
+                query_embeddings=[query_embedding],
+                n_results=n,
+                where=where,
+                include=include,
+            )
+        except Exception:
+            return []
+
+        if not res["ids"] or not res["ids"][0]:
+            return []
+
+        space = (col.metadata or {}).get("hnsw:space", "l2")
+        ids = res["ids"][0]
+        documents = res["documents"][0] if with_documents else [None] * len(ids)
+
+        return [
+            (
+                {
                     "file_path": meta.get("file_path", ""),
                     "chunk_index": meta.get("chunk_index", 0),
-                    "score": score,
+                    "score": _similarity(dist, space),
                     "preview": (doc or "")[:200],
                     "folder": meta.get("folder", ""),
                     "language": meta.get("language", ""),
-                })
+                },
+                col,
+                doc_id,
+            )
+            for doc_id, doc, meta, dist in zip(
+                ids,
+                documents,
+                res["metadatas"][0],
+                res["distances"][0],
+            )
+        ]
 
-        # Sort by score (best matches first)
-        results.sort(key=lambda r: r["score"], reverse=True)
-        return results[:top_k]
+    def _fill_previews(self, hits):
+        """Fetch chunk text for the given (result, collection, id) hits, one get per collection."""
+        by_collection = {}
+        for result, col, doc_id in hits:
+            by_collection.setdefault(col.name, (col, {}))[1][doc_id] = result
+
+        for col, results in by_collection.values():
+            try:
+                res = col.get(ids=list(results), include=["documents"])
+            except Exception:
+                continue  # previews stay empty
+            for doc_id, doc in zip(res["ids"], res["documents"] or []):
+                results[doc_id]["preview"] = (doc or "")[:200]
@@ -2,19 +2,26 @@
 Watcher — watches for file changes using watchdog and re-embeds them automatically.
 """
 
+import functools
+import queue
 import time
-import threading
 from pathlib import Path
 
 from watchdog.events import FileSystemEventHandler
 
 from embex.core.chunker import chunk_content
+from embex.core.history_store import _checksum
+from embex.core.scanner import _decode
 from embex.utils.ignore import should_ignore, get_relative_path, get_folder
 from embex.utils.language import detect_language
 from embex.utils.display import success, error, info
 
-# How many seconds to wait before processing the same file again
-DEBOUNCE_SECONDS = 1.0
+# How long to keep collecting events before processing a batch
+COALESCE_SECONDS = 0.3
+
+# Longest a batch keeps collecting, measured from its first event, so a file
+# rewritten more often than COALESCE_SECONDS can't hold processing off forever
+MAX_BATCH_SECONDS = 2.0
 
 
 class EmbexEventHandler(FileSystemEventHandler):
@@ -27,27 +34,34 @@ class EmbexEventHandler(FileSystemEventHandler):
         self.embedder = embedder
         self.vector_store = vector_store
         self.history_store = history_store
-        self.last_event_time = {}  # tracks when each file was last processed
-        self.lock = threading.Lock()
-
-    def _is_debounced(self, path):
-        """Check if we should skip this event (too soon after the last one)."""
-        now = time.time()
-        with self.lock:
-            last = self.last_event_time.get(path, 0)
-            if now - last < DEBOUNCE_SECONDS:
-                return True
-            self.last_event_time[path] = now
-            return False
-
-    def _process_file(self, file_path):
-        """Read a file, chunk it, embed chunks, and store them."""
+        self.events = queue.Queue()  # (file_path, deleted) from the observer thread
+        # Bursts (git pull, builds) hit the same paths repeatedly; the rules
+        # are fixed for the life of the watcher, so decisions can be cached
+        self._ignored = functools.lru_cache(maxsize=4096)(self._check_ignored)
+
+    def _check_ignored(self, path):
+        """should_ignore for a path string (wrapped in an LRU cache as self._ignored)."""
+        return should_ignore(Path(path), self.project_root, self.config)
+
+    def _prepare_file(self, file_path):
+        """Read, snapshot and chunk a file.
+
+        Returns (rel_path, folder, checksum, chunk_texts, metadata_base,
+        chunk_line_metas), or None if there is nothing to embed.
+        """
         rel_path = get_relative_path(file_path, self.project_root)
         folder = get_folder(file_path, self.project_root)
         language = detect_language(file_path)
 
         try:
-            content = file_path.read_text(encoding="utf-8", errors="replace")
+            data = file_path.read_bytes()
+
+            # Skip no-op writes (touch, auto-save) without re-embedding
+            checksum = _checksum(data)
+            if self.history_store.get_embed_checksum(rel_path) == checksum:
+                return None
+
+            content = _decode(data)
 
             # Save to history
             if self.config.history.enabled:
@@ -64,51 +78,120 @@ class EmbexEventHandler(FileSystemEventHandler):
                 chunk_size=self.config.chunking.chunk_size,
                 overlap=self.config.chunking.overlap,
             )
+        except Exception as exc:
+            error(f"Failed to process {rel_path}: {exc}")
+            return None
+
+        if not raw_chunks:
+            info(f"  {rel_path} — empty or no chunks")
+            return None
+
+        chunk_texts = [text for text, _, _, _ in raw_chunks]
+        chunk_line_metas = [
+            {"start_line": s, "end_line": e}
+            for _, _, s, e in raw_chunks
+        ]
+        metadata_base = {
+            "file_path": rel_path,
+            "folder": folder,
+            "language": language,
+            "last_modified": int(time.time()),
+            "project_root": str(self.project_root),
+        }
+        return rel_path, folder, checksum, chunk_texts, metadata_base, chunk_line_metas
+
+    def _process_files(self, file_paths):
+        """Chunk several files, embed all their chunks in one call, and store them."""
+        prepared = [entry for entry in map(self._prepare_file, file_paths) if entry is not None]
+        if not prepared:
+            return
 
-            if not raw_chunks:
-                info(f"  {rel_path} — empty or no chunks")
-                return
-
-            chunk_texts = [text for text, _, _, _ in raw_chunks]
-            chunk_line_metas = [
-                {"start_line": s, "end_line": e}
-                for _, _, s, e in raw_chunks
-            ]
-
-            # Generate embeddings
-            embeddings = self.embedder.embed_texts(chunk_texts)
-
-            # Store in vector database
-            metadata_base = {
-                "file_path": rel_path,
-                "folder": folder,
-                "language": language,
-                "last_modified": int(time.time()),
-                "project_root": str(self.project_root),
-            }
-            n = self.vector_store.upsert_file(
-                file_path=rel_path,
-                folder=folder,
-                chunks=chunk_texts,
-                embeddings=embeddings,
-                metadata_base=metadata_base,
-                chunk_metadatas=chunk_line_metas,
+        # Generate embeddings for every file's chunks together
+        try:
+            embeddings = self.embedder.embed_texts(
+                [text for _, _, _, chunk_texts, _, _ in prepared for text in chunk_texts]
             )
-            success(f"Embedded {rel_path} — {n} chunk(s)")
+        except Exception as exc:
+            error(f"Failed to embed {len(prepared)} file(s): {exc}")
+            return
 
+        # Group by folder, handing each file its slice of embeddings
+        by_folder = {}
+        start = 0
+        for rel_path, folder, checksum, chunk_texts, metadata_base, chunk_line_metas in prepared:
+            end = start + len(chunk_texts)
+            by_folder.setdefault(folder, []).append(
+                (rel_path, checksum, (rel_path, chunk_texts, embeddings[start:end], metadata_base, chunk_line_metas))
+            )
+            start = end
+
+        # Store in vector database, one batched write per folder's collection
+        for folder, batch in by_folder.items():
+            try:
+                self.vector_store.upsert_files(folder, [args for _, _, args in batch])
+            except Exception as exc:
+                error(f"Failed to store {len(batch)} file(s) in '{folder}': {exc}")
+                continue
+            for rel_path, checksum, (_, chunk_texts, _, _, _) in batch:
+                self.history_store.set_embed_checksum(rel_path, checksum, folder)
+                success(f"Embedded {rel_path} — {len(chunk_texts)} chunk(s)")
+
+        # Persist this batch's checksums now; a watcher is usually stopped by
+        # a signal, and close() would never run to flush them
+        self.history_store.flush()
+
+    def _remove_file(self, file_path):
+        """Remove the embeddings of a deleted file."""
+        rel_path = get_relative_path(file_path, self.project_root)
+        folder = get_folder(file_path, self.project_root)
+        try:
+            self.vector_store.delete_file(rel_path, folder)
+            self.history_store.delete_embed_checksum(rel_path)
+            info(f"Removed embeddings for deleted file: {rel_path}")
         except Exception as exc:
-            error(f"Failed to process {rel_path}: {exc}")
+            error(f"Failed to clean up {rel_path}: {exc}")
+
+    def process_pending(self, timeout=1.0):
+        """Wait up to timeout for events, then handle each affected file once.
+
+        Called from the main thread. Events keep being collected until none
+        arrive for COALESCE_SECONDS (or MAX_BATCH_SECONDS have passed since the
+        first one), so a burst of saves becomes one batch and only the last
+        event per file counts.
+        """
+        try:
+            file_path, deleted = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+        pending = {file_path: deleted}
+        deadline = time.monotonic() + MAX_BATCH_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                file_path, deleted = self.events.get(timeout=min(COALESCE_SECONDS, remaining))
+            except queue.Empty:
+                break
+            pending[file_path] = deleted
+
+        changed = []
+        for file_path, deleted in pending.items():
+            if deleted:
+                self._remove_file(file_path)
+            else:
+                changed.append(file_path)
+        self._process_files(changed)
 
     def _handle_event(self, event):
         """Common handler for file create/modify events."""
         if event.is_directory:
             return
-        file_path = Path(event.src_path)
-        if should_ignore(file_path, self.project_root, self.config):
-            return
-        if self._is_debounced(str(file_path)):
+        if self._ignored(event.src_path):
             return
-        self._process_file(file_path)
+        file_path = Path(event.src_path)
+        self.events.put((file_path, False))
 
     def on_created(self, event):
         self._handle_event(event)
@@ -117,16 +200,23 @@ class EmbexEventHandler(FileSystemEventHandler):
         self._handle_event(event)
 
     def on_deleted(self, event):
-        """When a file is deleted, remove its embeddings."""
+        """When a file is deleted, queue removal of its embeddings."""
         if event.is_directory:
             return
+        if self._ignored(event.src_path):
+            return
         file_path = Path(event.src_path)
-        if should_ignore(file_path, self.project_root, self.config):
+        self.events.put((file_path, True))
+
+    def on_moved(self, event):
+        """Treat a rename as a delete of the old path and a write of the new one.
+
+        Editors that save via a temp file and rename (vim, many IDEs) only
+        produce this event for the real file.
+        """
+        if event.is_directory:
             return
-        rel_path = get_relative_path(file_path, self.project_root)
-        folder = get_folder(file_path, self.project_root)
-        try:
-            self.vector_store.delete_file(rel_path, folder)
-            info(f"Removed embeddings for deleted file: {rel_path}")
-        except Exception as exc:
-            error(f"Failed to clean up {rel_path}: {exc}")
+        if not self._ignored(event.src_path):
+            self.events.put((Path(event.src_path), True))
+        if not self._ignored(event.dest_path):
+            self.events.put((Path(event.dest_path), False))
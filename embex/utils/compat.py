@@ -0,0 +1,67 @@
+"""
+Compatibility shims — patches applied only when chromadb is about to be imported.
+"""
+
+import os
+import sys
+import typing
+import warnings
+
+_applied = False
+
+
+def apply_chromadb_compat():
+    """Prepare the interpreter for importing chromadb. Safe to call repeatedly."""
+    global _applied
+    if _applied:
+        return
+    _applied = True
+
+    # Suppress Pydantic V1 compatibility warning
+    warnings.filterwarnings("ignore", message=".*Pydantic V1 functionality.*")
+
+    # Patch for Python 3.14+ compatibility with chromadb.
+    # Set EMBEX_PYDANTIC_PATCH=0 to skip it once chromadb no longer needs it.
+    if sys.version_info >= (3, 14) and os.environ.get("EMBEX_PYDANTIC_PATCH", "1") != "0":
+        try:
+            import pydantic.v1.fields as _pv1_fields
+            from pydantic.v1.errors import ConfigError
+
+            _orig_init = _pv1_fields.ModelField.__init__
+            _fallback_config = type("Config", (), {})
+
+            def _patched_field_init(self, *args, **kwargs):
+                try:
+                    _orig_init(self, *args, **kwargs)
+                except ConfigError as exc:
+                    if "unable to infer type" in str(exc):
+                        # Fallback: set minimal attributes so chromadb doesn't crash
+                        self.name = kwargs.get("name", "unknown")
+                        self.type_ = typing.Any
+                        self.outer_type_ = typing.Any
+                        self.class_validators = {}
+                        self.default = kwargs.get("default", None)
+                        self.default_factory = kwargs.get("default_factory", None)
+                        self.required = False
+                        self.model_config = kwargs.get("model_config", _fallback_config)
+                        self.field_info = kwargs.get("field_info", _pv1_fields.FieldInfo())
+                        self.allow_none = True
+                        self.validate_always = False
+                        self.sub_fields = None
+                        self.sub_fields_mapping = None
+                        self.key_field = None
+                        self.validators = {}
+                        self.pre_validators = None
+                        self.post_validators = None
+                        self.parse_json = False
+                        self.shape = 1
+                        self.alias = self.name
+                        self.has_alias = False
+                        self.discriminator_key = None
+                        self.discriminator_alias = None
+                    else:
+                        raise
+
+            _pv1_fields.ModelField.__init__ = _patched_field_init
+        except Exception:
+            pass
@@ -9,6 +9,9 @@ from rich import box
 console = Console()
 error_console = Console(stderr=True)
 
+# Line breaks -> spaces, so each preview stays on one table row
+_NEWLINES = str.maketrans({"\n": " ", "\r": " "})
+
 
 def success(message: str) -> None:
     """Print a green success message."""
@@ -58,7 +61,7 @@ def print_results_table(results: list[dict]) -> None:
             r["file_path"],
             str(r["chunk_index"]),
             score_str,
-            preview.replace("\n", " "),
+            preview.translate(_NEWLINES),
         )
 
     console.print(table)
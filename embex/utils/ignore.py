@@ -2,14 +2,21 @@
 Ignore rules — decides if a file should be skipped during scanning.
 """
 
-import fnmatch
+import functools
+import os
 from pathlib import Path, PurePosixPath
 
 
+@functools.lru_cache(maxsize=8)
+def _resolved_root(project_root):
+    """Resolve the project root once; it doesn't move during a run."""
+    return Path(project_root).resolve()
+
+
 def should_ignore(file_path, project_root, config):
     """Check if a file should be ignored based on config rules."""
     path = Path(file_path).resolve()
-    root = Path(project_root).resolve()
+    root = _resolved_root(project_root)
 
     # Get relative path
     try:
@@ -17,23 +24,33 @@ def should_ignore(file_path, project_root, config):
     except ValueError:
         return True  # file is outside project
 
-    rel_posix = PurePosixPath(rel)
+    return should_ignore_rel(PurePosixPath(rel).as_posix(), config)
+
+
+def should_ignore_rel(rel_path, config):
+    """Check a path already relative to the project root (forward slashes).
+
+    Pure string checks with no filesystem access, for callers like the
+    scanner's walk that build relative paths themselves.
+    """
     watch = config.watch
+    parts = rel_path.split("/")
+    name = parts[-1]
 
     # Check if any parent directory is excluded
-    for part in rel_posix.parts[:-1]:
-        if part in watch.exclude_dirs:
-            return True
+    exclude_dirs = watch.exclude_dirs_set
+    if any(part in exclude_dirs for part in parts[:-1]):
+        return True
 
     # Check if filename matches any exclude pattern
-    filename = rel_posix.name
-    for pattern in watch.exclude_files:
-        if fnmatch.fnmatch(filename, pattern):
-            return True
-
-    # Check if file extension is in the allowed list
-    ext = path.suffix.lower()
-    if ext not in watch.include_extensions:
+    exclude_files = watch.exclude_files_re
+    if exclude_files is not None and exclude_files.match(os.path.normcase(name)):
+        return True
+
+    # Check if file extension is in the allowed list (same rules as Path.suffix)
+    dot = name.rfind(".")
+    ext = name[dot:].lower() if dot > 0 else ""
+    if ext not in watch.include_extensions_set:
         return True
 
     return False
@@ -42,7 +59,7 @@ def should_ignore(file_path, project_root, config):
 def get_relative_path(file_path, project_root):
     """Get the relative path of a file from the project root (forward slashes)."""
     path = Path(file_path).resolve()
-    root = Path(project_root).resolve()
+    root = _resolved_root(project_root)
     return PurePosixPath(path.relative_to(root)).as_posix()
 
 
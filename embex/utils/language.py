@@ -2,7 +2,7 @@
 Language detection — maps file extensions to programming language names.
 """
 
-from pathlib import Path
+import os
 
 # Extension to language name mapping
 EXTENSION_MAP = {
@@ -46,5 +46,8 @@ EXTENSION_MAP = {
 
 def detect_language(file_path):
     """Detect the programming language from the file extension."""
-    ext = Path(file_path).suffix.lower()
+    # Same suffix rules as Path.suffix, without building a Path per file
+    name = os.path.basename(os.fspath(file_path))
+    dot = name.rfind(".")
+    ext = name[dot:].lower() if dot > 0 else ""
     return EXTENSION_MAP.get(ext, "unknown")
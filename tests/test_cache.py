@@ -0,0 +1,60 @@
+"""Tests for the local response cache."""
+
+import itertools
+import types
+
+from embex.core import cache
+from embex.core.cache import ResponseCache, cache_key
+
+
+def test_cache_key_is_whitespace_sensitive():
+    assert cache_key("model", "a") == cache_key("model", "a")
+    assert cache_key("model", "a") != cache_key("model", "b")
+    # Re-indenting code changes what it does, so it must change the key
+    nested = "if x:\n    f()\n    g()\n"
+    dedented = "if x:\n    f()\ng()\n"
+    assert cache_key("llm", "m", nested, "q") != cache_key("llm", "m", dedented, "q")
+    # Parts are separated, so moving text between them changes the key
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_text_round_trip(tmp_path):
+    store = ResponseCache(tmp_path / "cache.db")
+    assert store.get_text("k") is None
+    store.set_text("k", "answer — ✓")
+    assert store.get_text("k") == "answer — ✓"
+    store.set_text("k", "updated")
+    assert store.get_text("k") == "updated"
+    store.close()
+
+
+def test_vector_packed_as_float32(tmp_path):
+    store = ResponseCache(tmp_path / "cache.db")
+    store.set_vector("v", [0.5, -1.25, 3.0])
+    assert store.get_vector("v") == [0.5, -1.25, 3.0]
+
+    raw = store.conn.execute("SELECT value FROM cache WHERE key = 'v'").fetchone()[0]
+    assert len(raw) == 3 * 4
+
+    # Values are stored at float32 precision
+    store.set_vector("w", [0.1])
+    assert store.get_vector("w") != [0.1]
+    assert abs(store.get_vector("w")[0] - 0.1) < 1e-7
+    assert store.get_vector("missing") is None
+    store.close()
+
+
+def test_evicts_least_recently_used_beyond_max_entries(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(time=lambda: next(clock)))
+
+    store = ResponseCache(tmp_path / "cache.db", max_entries=3)
+    for key in ("a", "b", "c"):
+        store.set_text(key, key)
+    assert store.get_text("a") == "a"  # a is now the most recently used
+
+    store.set_text("d", "d")
+    assert store.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 3
+    assert store.get_text("b") is None
+    assert [store.get_text(k) for k in ("a", "c", "d")] == ["a", "c", "d"]
+    store.close()
@@ -0,0 +1,49 @@
+"""Tests for HistoryStore snapshot storage."""
+
+import time
+
+from embex.core.history_store import HistoryStore, _checksum
+
+
+def _insert_legacy(store, file_path, content):
+    """Write version 1 the way databases from before compression stored it: plain TEXT."""
+    now = int(time.time())
+    store.conn.execute(
+        "INSERT INTO file_registry (file_path, current_version, first_seen, last_modified, language, folder) "
+        "VALUES (?, 1, ?, ?, 'python', '.')",
+        (file_path, now, now),
+    )
+    store.conn.execute(
+        "INSERT INTO snapshots (file_path, version, content, timestamp, checksum) VALUES (?, 1, ?, ?, ?)",
+        (file_path, content, now, _checksum(content)),
+    )
+    store.conn.commit()
+
+
+def test_snapshot_round_trip(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as store:
+        assert store.snapshot_file("a.py", "print('hé')\n") == 1
+        assert store.snapshot_file("a.py", "print('hé')\n") == 1  # unchanged
+        assert store.snapshot_file("a.py", "print(2)\n") == 2
+        assert store.get_snapshot("a.py", 1) == "print('hé')\n"
+        assert store.get_latest_content("a.py") == "print(2)\n"
+
+
+def test_legacy_text_row_next_to_compressed_row(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as store:
+        _insert_legacy(store, "a.py", "x = 1\n")
+
+        # Same content as the legacy row is recognised as unchanged
+        assert store.snapshot_file("a.py", "x = 1\n") == 1
+        assert store.snapshot_file("a.py", "x = 2\n") == 2
+
+        stored = dict(store.conn.execute("SELECT version, typeof(content) FROM snapshots WHERE file_path = 'a.py'"))
+        assert stored == {1: "text", 2: "blob"}
+
+        assert store.get_snapshot("a.py", 1) == "x = 1\n"
+        assert store.get_snapshot("a.py", 2) == "x = 2\n"
+        assert store.get_snapshots(["a.py"], version=1) == {"a.py": (1, "x = 1\n")}
+        assert store.get_snapshots(["a.py"]) == {"a.py": (2, "x = 2\n")}
+
+        assert store.restore_to_version("a.py", 1)
+        assert store.get_latest_content("a.py") == "x = 1\n"
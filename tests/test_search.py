@@ -0,0 +1,47 @@
+"""Tests for the document scanners behind `embex search`."""
+
+import re
+
+from embex.cli.search import _literal_matches, _regex_matches
+
+
+def test_literal_first_hit_per_document():
+    docs = ["foo bar foo", "nothing here", "xx\nFOO"]
+    assert list(_literal_matches(docs, "foo")) == [(0, 0), (2, 1)]
+
+
+def test_literal_line_number_counts_within_document():
+    docs = ["a\nb\n", "one\ntwo\nthree needle"]
+    # Newlines in the first document must not shift the second one's lines
+    assert list(_literal_matches(docs, "needle")) == [(1, 2)]
+
+
+def test_literal_hit_spanning_separator_is_rejected():
+    # "ab" + "\x00" + "cd": a needle can't bridge two documents
+    assert list(_literal_matches(["ab", "cd"], "b\x00c")) == []
+    assert list(_literal_matches(["xab", "abx"], "ab")) == [(0, 0), (1, 0)]
+
+
+def test_literal_hit_at_end_of_document():
+    assert list(_literal_matches(["foo", "barfoo"], "foo")) == [(0, 0), (1, 0)]
+
+
+def test_literal_empty_and_none_documents():
+    docs = [None, "", "foo", None]
+    assert list(_literal_matches(docs, "foo")) == [(2, 0)]
+    assert list(_literal_matches([None, ""], "foo")) == []
+
+
+def test_regex_line_number_from_match_offset():
+    pat = re.compile(r"def \w+", re.IGNORECASE)
+    docs = ["import os\n\ndef main():\n    pass", None, "x = 1"]
+    assert list(_regex_matches(docs, pat)) == [(0, 2)]
+
+
+def test_regex_skips_leading_newlines_in_match():
+    pat = re.compile(r"\s*foo")
+    assert list(_regex_matches(["a\n\nfoo", "\n\nfoo"], pat)) == [(0, 2), (1, 2)]
+
+
+def test_regex_match_of_only_newlines_keeps_its_line():
+    assert list(_regex_matches(["a\nb"], re.compile(r"\n"))) == [(0, 0)]